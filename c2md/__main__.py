@@ -2,4 +2,5 @@
 
 from c2md.cli import main
 
-main()
+if __name__ == "__main__":
+    main()
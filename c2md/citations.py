@@ -11,6 +11,9 @@ from __future__ import annotations
 
 import re
 
+# Match [text](url) but NOT ![text](url) (images)
+_LINK_RE = re.compile(r"(?<!!)\[([^\]]*)\]\(([^)]+)\)")
+
 
 def add_citations(markdown: str) -> tuple[str, str]:
     """Convert inline links to numbered citations.
@@ -33,27 +36,22 @@ def add_citations(markdown: str) -> tuple[str, str]:
         if url.startswith("#"):
             return match.group(0)
 
-        if url not in urls:
+        ref_num = urls.get(url)
+        if ref_num is None:
             counter += 1
-            urls[url] = counter
+            ref_num = urls[url] = counter
 
-        ref_num = urls[url]
         # Return text with citation number -- avoid duplicating text
         if text.strip():
             return f"{text} [{ref_num}]"
         return f"[{ref_num}]"
 
-    # Match [text](url) but NOT ![text](url) (images)
-    pattern = r"(?<!!)\[([^\]]*)\]\(([^)]+)\)"
-    cited = re.sub(pattern, replace_link, markdown)
+    cited = _LINK_RE.sub(replace_link, markdown)
 
     if not urls:
         return markdown, ""
 
-    # Build references block
-    lines = ["", "## References", ""]
-    for url, num in sorted(urls.items(), key=lambda x: x[1]):
-        lines.append(f"[{num}] {url}")
-
-    references = "\n".join(lines)
+    # Build references block (dicts keep insertion order == citation order)
+    entries = "\n".join(f"[{num}] {url}" for url, num in urls.items())
+    references = f"\n## References\n\n{entries}"
     return cited, references
@@ -3,7 +3,11 @@
 from __future__ import annotations
 
 import asyncio
+import os
+import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
 
 import click
@@ -14,7 +18,7 @@ from rich.progress import Progress, SpinnerColumn, TextColumn
 
 from c2md.citations import add_citations
 from c2md.convert import convert_file, html_to_markdown
-from c2md.extract import extract_date_from_html, extract_metadata, sort_results_by_date
+from c2md.extract import extract_date_from_html_text, extract_metadata, sort_results_by_date
 from c2md.media import (
     download_and_compress_images,
     download_images_as_base64,
@@ -22,10 +26,16 @@ from c2md.media import (
     find_image_urls,
 )
 from c2md.output import save_archive, save_markdown, save_pdf, save_screenshot
-from c2md.utils import url_to_slug
+from c2md.utils import is_near_duplicate, simhash, url_to_slug
 
 console = Console(stderr=True)
 
+# Markdown image syntax, stripped by --no-images
+_IMG_RE = re.compile(r"!\[[^\]]*\]\([^)]+\)\s*")
+
+# Deep crawls with at least this many pages convert HTML in a process pool
+PARALLEL_CONVERT_MIN = 4
+
 # Markdown post-processing (ported from c4md.processors)
 from c2md._postprocess import clean_markdown  # noqa: E402
 
@@ -228,21 +238,28 @@ def _process_result(
     embed_images: bool, download_images_flag: bool, image_width: int,
     screenshot_quality: int, screenshot_width: int | None,
     output_path: str | None, verbose: bool,
+    converted: str | None = None,
 ) -> None:
-    """Process a single FetchResult into the desired output."""
-    from bs4 import BeautifulSoup
+    """Process a single FetchResult into the desired output.
+
+    *converted* is html_to_markdown() output already computed for this
+    result (deep-crawl dedupe); it is used instead of converting again.
+    """
+    # Resolve the output target once; each mode below only picks a filename
+    out = Path(output_path) if output_path else None
+    out_is_dir = out is not None and (output_path.endswith("/") or out.is_dir())
 
     if mode == "markdown":
-        markdown = html_to_markdown(
-            result.html, url=url,
-            strip_boilerplate=not raw,
-            selector=selector,
-        )
-        markdown = clean_markdown(markdown)
+        if converted is None:
+            converted = html_to_markdown(
+                result.html, url=url,
+                strip_boilerplate=not raw,
+                selector=selector,
+            )
+        markdown = clean_markdown(converted)
 
         if no_images:
-            import re
-            markdown = re.sub(r"!\[[^\]]*\]\([^)]+\)\s*", "", markdown)
+            markdown = _IMG_RE.sub("", markdown)
 
         references = ""
         if refs:
@@ -261,7 +278,7 @@ def _process_result(
         elif download_images_flag and output_path:
             image_urls = find_image_urls(markdown)
             if image_urls:
-                out_dir = Path(output_path) if Path(output_path).is_dir() else Path(output_path).parent
+                out_dir = out if out_is_dir else out.parent
                 images_dir = out_dir / f"{slug}_images"
                 url_to_path = download_and_compress_images(
                     image_urls, images_dir, max_width=image_width,
@@ -275,10 +292,7 @@ def _process_result(
 
         # Output
         if output_path:
-            out = Path(output_path)
-            if out.is_dir() or output_path.endswith("/"):
-                out.mkdir(parents=True, exist_ok=True)
-                out = out / f"{slug}.md"
+            out = _output_file(out, out_is_dir, f"{slug}.md")
             save_markdown(markdown, out)
             console.print(f"[green]Saved:[/green] {out}")
             if references:
@@ -295,11 +309,8 @@ def _process_result(
         if not result.screenshot:
             raise click.ClickException("No screenshot data (use --browser for JS sites)")
         if output_path:
-            out = Path(output_path)
-            if out.is_dir() or output_path.endswith("/"):
-                out.mkdir(parents=True, exist_ok=True)
-                ext = ".jpg" if screenshot_width else ".png"
-                out = out / f"{slug}{ext}"
+            ext = ".jpg" if screenshot_width else ".png"
+            out = _output_file(out, out_is_dir, f"{slug}{ext}")
             size = save_screenshot(
                 result.screenshot, out,
                 quality=screenshot_quality, max_width=screenshot_width,
@@ -313,10 +324,7 @@ def _process_result(
         if not result.pdf:
             raise click.ClickException("No PDF data (use --browser for JS sites)")
         if output_path:
-            out = Path(output_path)
-            if out.is_dir() or output_path.endswith("/"):
-                out.mkdir(parents=True, exist_ok=True)
-                out = out / f"{slug}.pdf"
+            out = _output_file(out, out_is_dir, f"{slug}.pdf")
             save_pdf(result.pdf, out)
             console.print(f"[green]Saved:[/green] {out}")
         else:
@@ -326,29 +334,27 @@ def _process_result(
         metadata = extract_metadata(result.html, url)
         meta_json = orjson.dumps(metadata, option=orjson.OPT_INDENT_2)
         if output_path:
-            out = Path(output_path)
-            if out.is_dir() or output_path.endswith("/"):
-                out.mkdir(parents=True, exist_ok=True)
-                out = out / f"{slug}_meta.json"
+            out = _output_file(out, out_is_dir, f"{slug}_meta.json")
             out.parent.mkdir(parents=True, exist_ok=True)
             out.write_bytes(meta_json)
             console.print(f"[green]Saved:[/green] {out}")
         else:
-            click.echo(meta_json.decode())
+            # Write the orjson bytes as-is; skips a decode/re-encode round trip
+            sys.stdout.buffer.write(meta_json)
+            sys.stdout.buffer.write(b"\n")
 
     elif mode == "archive":
         if not output_path:
             raise click.ClickException("Archive mode requires -o/--output")
 
-        out_dir = Path(output_path)
-        if not output_path.endswith("/"):
-            out_dir = out_dir / slug
+        out_dir = out if output_path.endswith("/") else out / slug
 
-        markdown = html_to_markdown(
-            result.html, url=url,
-            strip_boilerplate=not raw, selector=selector,
-        )
-        markdown = clean_markdown(markdown)
+        if converted is None:
+            converted = html_to_markdown(
+                result.html, url=url,
+                strip_boilerplate=not raw, selector=selector,
+            )
+        markdown = clean_markdown(converted)
 
         references = ""
         if refs:
@@ -381,10 +387,26 @@ def _run_deep_crawl(
     output_path: str | None,
 ) -> None:
     """Run a deep crawl and process all results."""
-    import xxhash
     from c2md.crawl import deep_crawl
     from c2md.fetch import BrowserSession
 
+    # Every page is saved into the output directory; check before crawling
+    # that -o can be one
+    if not output_path:
+        output_path = "./output"
+    out_dir = Path(output_path)
+    if not out_dir.is_dir():
+        if out_dir.exists():
+            raise click.ClickException(
+                f"--deep writes one file per page; -o {output_path} is a file, "
+                "not a directory"
+            )
+        if out_dir.suffix and not output_path.endswith("/"):
+            raise click.ClickException(
+                f"--deep writes one file per page; -o {output_path} looks like "
+                "a file name (end it with / to use it as a directory)"
+            )
+
     async def _crawl():
         async with BrowserSession(
             headless=not no_headless, timeout=timeout,
@@ -412,16 +434,22 @@ def _run_deep_crawl(
     if verbose:
         console.print(f"[dim]Crawled {len(results)} pages[/dim]")
 
+    # Conversions are kept (by result id) so a page converted for dedupe
+    # isn't converted a second time in _process_result.
+    converted: dict[int, str] = {}
+
     # Deduplicate
     if dedupe and len(results) > 1:
         before = len(results)
-        seen = set()
+        _convert_results(results, raw, selector, converted)
+        # SimHash over word shingles also drops near-duplicates, e.g. pages
+        # that differ only by a date or view count
+        seen: list[int] = []
         unique = []
         for r in results:
-            markdown = html_to_markdown(r.html, r.url, strip_boilerplate=not raw)
-            fp = xxhash.xxh64(markdown.encode()).hexdigest()
-            if fp not in seen:
-                seen.add(fp)
+            fp = simhash(converted[id(r)])
+            if not is_near_duplicate(fp, seen):
+                seen.append(fp)
                 unique.append(r)
         results = unique
         if verbose and len(results) < before:
@@ -429,13 +457,9 @@ def _run_deep_crawl(
 
     # Sort by date
     if sort_by_date and len(results) > 1:
-        from bs4 import BeautifulSoup
-        from c2md.extract import extract_date_from_html
-
         tagged = []
         for r in results:
-            soup = BeautifulSoup(r.html, "lxml")
-            date = extract_date_from_html(soup)
+            date = extract_date_from_html_text(r.html)
             tagged.append({"result": r, "published_date": date, "url": r.url})
 
         tagged = sort_results_by_date(tagged, descending=True)
@@ -454,9 +478,11 @@ def _run_deep_crawl(
             console.print(f"[dim]Limiting to {limit} results[/dim]")
         results = results[:limit]
 
-    # Process each result
-    if not output_path:
-        output_path = "./output"
+    if mode in ("markdown", "archive"):
+        _convert_results(results, raw, selector, converted)
+
+    # Process each result, creating the output directory once up front
+    out_dir.mkdir(parents=True, exist_ok=True)
 
     for i, result in enumerate(results):
         page_slug = url_to_slug(result.url)
@@ -467,6 +493,7 @@ def _run_deep_crawl(
             result, result.url, page_slug, mode, raw, selector, refs,
             no_images, embed_images, download_images_flag, image_width,
             screenshot_quality, screenshot_width, output_path, verbose,
+            converted=converted.get(id(result)),
         )
 
     if verbose:
@@ -475,5 +502,44 @@ def _run_deep_crawl(
         )
 
 
+def _output_file(out: Path, out_is_dir: bool, name: str) -> Path:
+    """Return the file to write: *out* itself, or *name* inside directory *out*."""
+    if out_is_dir:
+        out.mkdir(parents=True, exist_ok=True)
+        return out / name
+    return out
+
+
+def _convert_html(html: str, url: str, raw: bool, selector: str | None) -> str:
+    """html_to_markdown() with CLI options; module-level so it pickles."""
+    return html_to_markdown(html, url=url, strip_boilerplate=not raw, selector=selector)
+
+
+def _convert_results(
+    results: list, raw: bool, selector: str | None, converted: dict[int, str],
+) -> None:
+    """Convert results not yet in *converted* (keyed by id), in place.
+
+    Conversion is CPU-bound and independent per page, so larger batches are
+    spread across a process pool; small ones stay serial to skip the
+    worker start-up cost.
+    """
+    todo = [r for r in results if id(r) not in converted]
+    if len(todo) < PARALLEL_CONVERT_MIN:
+        for r in todo:
+            converted[id(r)] = _convert_html(r.html, r.url, raw, selector)
+        return
+
+    workers = min(len(todo), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        markdowns = pool.map(
+            _convert_html,
+            [r.html for r in todo], [r.url for r in todo],
+            repeat(raw), repeat(selector),
+        )
+        for r, markdown in zip(todo, markdowns):
+            converted[id(r)] = markdown
+
+
 if __name__ == "__main__":
     main()
@@ -2,10 +2,18 @@
 
 from __future__ import annotations
 
-from bs4 import BeautifulSoup
+import copy
+import re
+
+from bs4 import BeautifulSoup, Tag
 from markdownify import markdownify as md
 from readability import Document
 
+_BLANKS_RE = re.compile(r"\n{4,}")
+_TRAIL_WS_RE = re.compile(r"[^\S\n]+(?=\n)")
+
+_STRIP_TAGS = ["script", "style", "nav", "footer", "header", "aside"]
+
 
 def html_to_markdown(
     html: str,
@@ -24,26 +32,39 @@ def html_to_markdown(
         return ""
 
     content_html = html
+    soup = None
+    selected = None
 
     if selector:
         # CSS selector takes priority over readability
         soup = BeautifulSoup(html, "lxml")
         selected = soup.select(selector)
         if selected:
-            content_html = "\n".join(str(el) for el in selected)
+            # Strip copies of the selected nodes rather than re-parsing their
+            # output. Stripping in place would lose a selected node nested in
+            # a stripped tag of another one (e.g. "h1, article" with the h1
+            # inside the article's <header>).
+            parts = []
+            for el in selected:
+                el = copy.copy(el)
+                _strip_unwanted_tags(el)
+                if el.name not in _STRIP_TAGS:
+                    parts.append(str(el))
+            content_html = "\n".join(parts)
         # If selector finds nothing, fall through to readability
         elif strip_boilerplate:
             content_html = _readability_extract(html, url)
     elif strip_boilerplate:
         content_html = _readability_extract(html, url)
 
-    # Strip unwanted tags via BeautifulSoup before conversion
-    # (markdownify doesn't allow both strip and convert simultaneously)
-    soup = BeautifulSoup(content_html, "lxml")
-    for tag_name in ("script", "style", "nav", "footer", "header", "aside"):
-        for tag in soup.find_all(tag_name):
-            tag.decompose()
-    content_html = str(soup)
+    if not selected:
+        # Strip unwanted tags via BeautifulSoup before conversion
+        # (markdownify doesn't allow both strip and convert simultaneously).
+        # A selector that matched nothing already parsed the raw page.
+        if soup is None or content_html is not html:
+            soup = BeautifulSoup(content_html, "lxml")
+        _strip_unwanted_tags(soup)
+        content_html = str(soup)
 
     markdown = md(
         content_html,
@@ -69,15 +90,17 @@ def _readability_extract(html: str, url: str = "") -> str:
     return doc.summary()
 
 
-def _clean_output(markdown: str) -> str:
-    """Clean up markdownify output artifacts."""
-    import re
+def _strip_unwanted_tags(soup: Tag) -> None:
+    """Remove script/style and page-chrome tags from a parsed tree in place."""
+    for tag in soup.find_all(_STRIP_TAGS):
+        tag.decompose()
 
-    # Collapse runs of 3+ blank lines to 2
-    markdown = re.sub(r"\n{4,}", "\n\n\n", markdown)
 
-    # Remove trailing whitespace per line
-    lines = [line.rstrip() for line in markdown.split("\n")]
-    markdown = "\n".join(lines)
+def _clean_output(markdown: str) -> str:
+    """Clean up markdownify output artifacts.
 
-    return markdown.strip()
+    Collapses runs of 3+ blank lines to 2, then removes trailing whitespace
+    per line.
+    """
+    markdown = _BLANKS_RE.sub("\n\n\n", markdown)
+    return _TRAIL_WS_RE.sub("", markdown).strip()
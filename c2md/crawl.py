@@ -2,13 +2,28 @@
 
 from __future__ import annotations
 
+import asyncio
 import fnmatch
 import re
+from functools import lru_cache
 from urllib.parse import urljoin, urlparse
 
-from bs4 import BeautifulSoup
-
 from c2md.fetch import BrowserSession, FetchResult
+from c2md.utils import parse_html
+
+# scheme, netloc, path of an http(s) URL -- the crawler's fast path for
+# _normalize_url. Anything else (;params paths, embedded tabs/newlines that
+# urlparse removes) falls back to urlparse.
+_URL_PARTS_RE = re.compile(
+    r"(https?)://([^/?#\t\r\n]*)([^?#;\t\r\n]*)(?=[?#]|\Z)", re.I,
+)
+# hrefs that never lead to a page: in-page fragments and non-HTTP actions.
+# A str.startswith tuple check measured faster than an equivalent regex.
+_SKIP_PREFIXES = ("#", "javascript:", "mailto:", "tel:")
+# Link targets that are files rather than pages, matched on the URL path
+_SKIP_EXT_RE = re.compile(
+    r"\.(?:jpe?g|png|gif|webp|svg|pdf|zip|tar|gz|mp4|css|js|xml)$", re.I,
+)
 
 
 async def deep_crawl(
@@ -19,6 +34,7 @@ async def deep_crawl(
     url_pattern: str | None = None,
     screenshot: bool = False,
     pdf: bool = False,
+    concurrency: int = 4,
 ) -> list[FetchResult]:
     """Follow links up to *depth* levels deep from start_url. Same-domain only.
 
@@ -30,15 +46,29 @@ async def deep_crawl(
         url_pattern: Glob pattern to filter discovered URLs
         screenshot: Capture screenshots for each page
         pdf: Capture PDFs for each page
+        concurrency: Max pages fetched at once (each fetch opens its own
+            tab in the session's browser context)
     """
     parsed_start = urlparse(start_url)
     base_domain = parsed_start.netloc
+    # Translate the glob once rather than per discovered URL
+    url_re = re.compile(fnmatch.translate(url_pattern)) if url_pattern else None
 
     # Fetch the start page
     start_result = await session.fetch(start_url, screenshot=screenshot, pdf=pdf)
     results = [start_result]
     visited = {_normalize_url(start_url)}
 
+    sem = asyncio.Semaphore(concurrency)
+
+    async def _fetch(url: str) -> FetchResult | None:
+        async with sem:
+            try:
+                result = await session.fetch(url, screenshot=screenshot, pdf=pdf)
+            except Exception:
+                return None
+        return result if result.status < 400 else None
+
     # BFS across depth levels
     frontier = [start_result]
     for _level in range(depth):
@@ -49,25 +79,25 @@ async def deep_crawl(
 
             discovered = _extract_links(page.html, page.url, base_domain)
 
-            if url_pattern:
-                discovered = [u for u in discovered if fnmatch.fnmatch(u, url_pattern)]
+            if url_re:
+                discovered = [u for u in discovered if url_re.match(u)]
 
+            pending = []
             for url in discovered:
-                if len(results) >= max_pages:
-                    break
-
                 normalized = _normalize_url(url)
-                if normalized in visited:
-                    continue
-                visited.add(normalized)
-
-                try:
-                    result = await session.fetch(url, screenshot=screenshot, pdf=pdf)
-                    if result.status < 400:
+                if normalized not in visited:
+                    visited.add(normalized)
+                    pending.append(url)
+
+            # Fetch in concurrent batches sized to the remaining page budget;
+            # failed fetches don't count, so top up from the pending links.
+            while pending and len(results) < max_pages:
+                batch = pending[:max_pages - len(results)]
+                pending = pending[len(batch):]
+                for result in await asyncio.gather(*(_fetch(u) for u in batch)):
+                    if result is not None:
                         results.append(result)
                         next_frontier.append(result)
-                except Exception:
-                    continue
 
         frontier = next_frontier
         if not frontier or len(results) >= max_pages:
@@ -78,14 +108,18 @@ async def deep_crawl(
 
 def _extract_links(html: str, base_url: str, base_domain: str) -> list[str]:
     """Extract same-domain links from HTML."""
-    soup = BeautifulSoup(html, "lxml")
+    doc = parse_html(html)
+    if doc is None:
+        return []
     links = []
 
-    for a in soup.find_all("a", href=True):
-        href = a["href"]
+    for a in doc.iter("a"):
+        href = a.get("href")
+        if href is None:
+            continue
 
         # Skip fragments, javascript, mailto
-        if href.startswith(("#", "javascript:", "mailto:", "tel:")):
+        if href.startswith(_SKIP_PREFIXES):
             continue
 
         # Resolve relative URLs
@@ -101,7 +135,7 @@ def _extract_links(html: str, base_url: str, base_domain: str) -> list[str]:
             continue
 
         # Skip common non-page extensions
-        if re.search(r"\.(jpg|jpeg|png|gif|svg|pdf|zip|tar|gz|css|js|xml)$", parsed.path, re.I):
+        if _SKIP_EXT_RE.search(parsed.path):
             continue
 
         links.append(absolute)
@@ -118,8 +152,16 @@ def _extract_links(html: str, base_url: str, base_domain: str) -> list[str]:
     return unique
 
 
+@lru_cache(maxsize=16384)
 def _normalize_url(url: str) -> str:
-    """Normalize URL for dedup (strip fragment, trailing slash)."""
+    """Normalize URL for dedup (strip fragment, trailing slash).
+
+    Cached: cross-linked sites surface the same hrefs on page after page.
+    """
+    m = _URL_PARTS_RE.match(url)
+    if m:
+        scheme, netloc, path = m.groups()
+        return f"{scheme.lower()}://{netloc}{path.rstrip('/') or '/'}"
     parsed = urlparse(url)
     path = parsed.path.rstrip("/") or "/"
     return f"{parsed.scheme}://{parsed.netloc}{path}"
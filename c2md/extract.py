@@ -4,10 +4,70 @@ from __future__ import annotations
 
 import re
 from collections import Counter
+from dataclasses import dataclass, field
 from datetime import datetime
+from functools import lru_cache
+from operator import itemgetter
+from html import unescape
 from urllib.parse import urlparse
 
 from bs4 import BeautifulSoup
+from lxml import etree
+from lxml import html as lxml_html
+
+from c2md.utils import parse_html
+
+# Meta tag names/properties holding a publish date, in priority order
+_DATE_META_NAMES = (
+    "date", "published", "datePublished", "article:published_time",
+    "og:article:published_time", "pubdate", "publish_date",
+    "DC.date.issued", "sailthru.date",
+)
+
+_DATE_ISO_RE = re.compile(r"^\d{4}-\d{2}-\d{2}")
+
+_MONTHS = (
+    "January|February|March|April|May|June|July|August|September|October|"
+    "November|December"
+)
+
+# Date shapes searched by _find_date_in_text, in priority order: ISO
+# (YYYY-MM-DD), "Jan 5, 2024", "5 January 2024". Wrapped in a lookahead so
+# one finditer reports every start position without matches consuming each
+# other; at most one alternative can match at a given position. The leading
+# character class rejects most positions before the alternation is tried.
+# Every month name starts with its abbreviation, so "abbreviation + [a-z]*"
+# covers both spellings.
+_DATE_RE = re.compile(
+    r"(?=[\dJFMASOND])(?="
+    r"(?P<iso>\d{4}-\d{2}-\d{2})"
+    r"|(?P<mdy_month>(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*)"
+    r"\.?\s+(?P<mdy_day>\d{1,2}),?\s+(?P<mdy_year>\d{4})"
+    r"|(?P<dmy_day>\d{1,2})\s+(?P<dmy_month>" + _MONTHS + r")\s+(?P<dmy_year>\d{4})"
+    r")",
+    re.IGNORECASE,
+)
+
+# Elements whose own text get_text() leaves out
+_NON_TEXT_TAGS = frozenset(("script", "style"))
+
+# Netloc of an absolute http(s) href, as urlparse would split it; hrefs
+# with tabs/newlines in the netloc (which urlparse deletes) don't match.
+_HTTP_NETLOC_RE = re.compile(r"https?://([^/?#\t\r\n]*)(?=[/?#]|\Z)", re.I)
+
+_META_TAG_RE = re.compile(r"<meta\b[^>]*>", re.I)
+# A <meta> tag (group 2) outside comments and raw-text elements, whose
+# content the parser never turns into tags. Skipped spans may run
+# unterminated to the end of the input.
+_META_SCAN_RE = re.compile(
+    r"<(?:!--[^-]*(?:-(?!->)[^-]*)*(?:-->)?"
+    r"|(script|style|title|textarea|xmp|iframe|noembed|noframes)\b"
+    r"[^<]*(?:<(?!/\1\s*>)[^<]*)*(?:</\1\s*>)?"
+    r"|plaintext\b.*"
+    r"|(meta\b[^>]*>))",
+    re.I | re.S,
+)
+_ATTR_RE = re.compile(r"""([\w:.-]+)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))""")
 
 
 def extract_metadata(html: str, url: str) -> dict:
@@ -19,60 +79,43 @@ def extract_metadata(html: str, url: str) -> dict:
     - Link analysis: internal/external link counts, top external domains
     - Media: image_count, video_count
     - SEO: canonical_url, og tags
+
+    Everything is gathered in one walk over an lxml tree.
     """
-    soup = BeautifulSoup(html, "lxml")
+    page = _scan_page(parse_html(html))
     parsed_url = urlparse(url)
     base_domain = parsed_url.netloc
 
+    metas = _merge_meta(page.by_name, page.by_property)
+
     # Basic info from meta tags
-    title = _get_meta(soup, "og:title") or _get_title(soup)
-    description = _get_meta(soup, "og:description") or _get_meta(soup, "description")
-    author = _get_meta(soup, "author") or _get_meta(soup, "article:author")
-    published_date = extract_date_from_html(soup)
-
-    # Content stats (from visible text)
-    text = soup.get_text(separator=" ", strip=True)
-    words = text.split()
-    word_count = len(words)
+    title = _get_meta(metas, "og:title") or page.title
+    description = _get_meta(metas, "og:description") or _get_meta(metas, "description")
+    author = _get_meta(metas, "author") or _get_meta(metas, "article:author")
+    published_date = _page_date(page, metas)
+
+    # Content stats (from visible text). len(str.split()) beats counting
+    # \S+ regex matches by ~6x; the word list is dropped right away.
+    word_count = len(page.text.split())
     reading_time_minutes = max(1, round(word_count / 238))
 
-    # Link analysis
-    all_links = soup.find_all("a", href=True)
-    internal_links = []
-    external_links = []
-    for a in all_links:
-        href = a["href"]
+    # Link analysis; external domains are tallied as links are classified
+    internal_link_count = 0
+    ext_domains: Counter[str] = Counter()
+    for href in page.hrefs:
         if href.startswith(("#", "javascript:", "mailto:", "tel:")):
             continue
-        link_parsed = urlparse(href)
-        if link_parsed.netloc and link_parsed.netloc != base_domain:
-            external_links.append(href)
+        netloc = _link_netloc(href)
+        if netloc and netloc != base_domain:
+            ext_domains[netloc] += 1
         else:
-            internal_links.append(href)
-
-    # Top external domains
-    ext_domains = []
-    for href in external_links:
-        try:
-            domain = urlparse(href).netloc
-            if domain:
-                ext_domains.append(domain)
-        except Exception:
-            pass
-    top_domains = [d for d, _ in Counter(ext_domains).most_common(10)]
-
-    # Media
-    images = soup.find_all("img")
-    videos = soup.find_all(["video", "iframe"])
+            internal_link_count += 1
+    top_domains = [d for d, _ in ext_domains.most_common(10)]
 
     # SEO / OG
-    canonical_url = ""
-    canonical_tag = soup.find("link", rel="canonical")
-    if canonical_tag:
-        canonical_url = canonical_tag.get("href", "")
-    og_image = _get_meta(soup, "og:image") or ""
-    og_type = _get_meta(soup, "og:type") or ""
-    og_site_name = _get_meta(soup, "og:site_name") or ""
+    og_image = _get_meta(metas, "og:image") or ""
+    og_type = _get_meta(metas, "og:type") or ""
+    og_site_name = _get_meta(metas, "og:site_name") or ""
 
     return {
         "url": url,
@@ -82,12 +125,12 @@ def extract_metadata(html: str, url: str) -> dict:
         "published_date": published_date,
         "word_count": word_count,
         "reading_time_minutes": reading_time_minutes,
-        "internal_link_count": len(internal_links),
-        "external_link_count": len(external_links),
+        "internal_link_count": internal_link_count,
+        "external_link_count": ext_domains.total(),
         "top_external_domains": top_domains,
-        "image_count": len(images),
-        "video_count": len(videos),
-        "canonical_url": canonical_url,
+        "image_count": page.image_count,
+        "video_count": page.video_count,
+        "canonical_url": page.canonical_url,
         "og_image": og_image,
         "og_type": og_type,
         "og_site_name": og_site_name,
@@ -99,33 +142,74 @@ def extract_date_from_html(soup: BeautifulSoup) -> str | None:
 
     Tries in order:
     1. Standard metadata fields
-    2. Date patterns in visible text (first 1000 chars)
+    2. <time datetime> elements
+    3. Date patterns in visible text (first 1000 chars)
 
     Returns ISO date (YYYY-MM-DD) or None.
     """
-    # Strategy 1: meta tags
-    date_meta_names = [
-        "date", "published", "datePublished", "article:published_time",
-        "og:article:published_time", "pubdate", "publish_date",
-        "DC.date.issued", "sailthru.date",
-    ]
-    for name in date_meta_names:
-        content = _get_meta(soup, name)
-        if content:
-            parsed = _parse_date_string(content)
-            if parsed:
-                return parsed
+    by_name: dict[str, str] = {}
+    by_property: dict[str, str] = {}
+    for tag in soup.find_all("meta"):
+        content = tag.get("content") or ""
+        if tag.get("name") is not None:
+            by_name.setdefault(tag["name"], content)
+        if tag.get("property") is not None:
+            by_property.setdefault(tag["property"], content)
+    parsed = _date_from_meta(_merge_meta(by_name, by_property))
+    if parsed:
+        return parsed
 
-    # Also check <time> elements
     time_el = soup.find("time", datetime=True)
     if time_el:
         parsed = _parse_date_string(time_el["datetime"])
         if parsed:
             return parsed
 
-    # Strategy 2: date patterns in visible text
-    text = soup.get_text(separator=" ", strip=True)[:1000]
-    return _find_date_in_text(text)
+    # get_text(" ", strip=True)[:1000], without walking past the first 1000
+    parts = []
+    size = -1  # length of " ".join(parts)
+    for string in soup.stripped_strings:
+        parts.append(string)
+        size += len(string) + 1
+        if size >= 1000:
+            break
+    return _find_date_in_text(" ".join(parts)[:1000])
+
+
+def extract_date_from_html_text(html: str) -> str | None:
+    """Extract publication date from raw HTML, parsing only when needed.
+
+    Scans <meta> tags with a regex (same names and priority as
+    extract_date_from_html), skipping comments and script/style text as the
+    parser does, and only parses the page, with lxml, for the
+    <time>/visible-text strategies when no meta date is found.
+    """
+    by_name: dict[str, str] = {}
+    by_property: dict[str, str] = {}
+    # Nothing after the last <meta> can matter, so the slower scan that
+    # skips comments and raw text stops there
+    last = max((tag.end() for tag in _META_TAG_RE.finditer(html)), default=0)
+    for match in _META_SCAN_RE.finditer(html, 0, last):
+        tag = match.group(2)
+        if not tag:
+            continue
+        attrs = {
+            key.lower(): dq or sq or bare
+            for key, dq, sq, bare in _ATTR_RE.findall(tag)
+        }
+        content = unescape(attrs.get("content", ""))
+        if "name" in attrs:
+            by_name.setdefault(attrs["name"], content)
+        if "property" in attrs:
+            by_property.setdefault(attrs["property"], content)
+
+    parsed = _date_from_meta(_merge_meta(by_name, by_property))
+    if parsed:
+        return parsed
+
+    # The regex scan above already covered the meta tags
+    page = _scan_page(parse_html(html), text_limit=1000)
+    return _parse_date_string(page.time_datetime) or _find_date_in_text(page.text[:1000])
 
 
 def extract_date_from_markdown(markdown: str) -> str | None:
@@ -140,33 +224,169 @@ def sort_results_by_date(
     descending: bool = True,
 ) -> list[dict]:
     """Sort results by extracted date. Results without dates go to end."""
-    def get_sort_key(item: dict) -> tuple[str, str]:
-        date = item.get("published_date")
-        if date is None:
-            return ("9999-99-99" if descending else "0000-00-00", item.get("url", ""))
-        return (date, item.get("url", ""))
-
-    return sorted(results, key=get_sort_key, reverse=descending)
+    # The sentinel sorts after every real date in the requested direction
+    missing = "0000-00-00" if descending else "9999-99-99"
+    # Keys built in one pass and paired with their rows; sorting on
+    # itemgetter(0) keeps ties in input order, as sorted(key=...) did
+    keyed = [
+        ((r.get("published_date") or missing, r.get("url", "")), r) for r in results
+    ]
+    keyed.sort(key=itemgetter(0), reverse=descending)
+    return [r for _, r in keyed]
 
 
 # --- Private helpers ---
 
 
-def _get_meta(soup: BeautifulSoup, name: str) -> str | None:
-    """Get content from a meta tag by name or property."""
-    tag = soup.find("meta", attrs={"name": name})
-    if tag and tag.get("content"):
-        return tag["content"]
-    tag = soup.find("meta", attrs={"property": name})
-    if tag and tag.get("content"):
-        return tag["content"]
+@dataclass
+class _PageScan:
+    """What extract_metadata needs from a page, gathered by _scan_page."""
+
+    by_name: dict[str, str] = field(default_factory=dict)
+    by_property: dict[str, str] = field(default_factory=dict)
+    title: str = ""
+    hrefs: list[str] = field(default_factory=list)
+    image_count: int = 0
+    video_count: int = 0
+    canonical_url: str = ""
+    time_datetime: str = ""
+    text: str = ""
+
+
+def _scan_page(
+    doc: lxml_html.HtmlElement | None, text_limit: int | None = None,
+) -> _PageScan:
+    """Collect meta tags, title, links, media and visible text in one walk.
+
+    Mirrors the BeautifulSoup lookups it replaces: first match wins for
+    meta/title/canonical/<time>, and text is get_text(" ", strip=True)
+    (script, style and template content excluded).
+
+    With *text_limit*, the walk stops once text[:text_limit] is complete,
+    for callers that only need a date. Everything else then covers only the
+    part walked, except time_datetime, which is still looked up in the
+    rest of the page.
+    """
+    page = _PageScan()
+    if doc is None:
+        return page
+
+    strings: list[str] = []
+    size = -1  # length of " ".join(strings)
+    limit = float("inf") if text_limit is None else text_limit
+    have_title = have_canonical = have_time = False
+    in_template = 0
+
+    def add(s: str | None) -> None:
+        nonlocal size
+        if s and not in_template:
+            s = s.strip()
+            if s:
+                strings.append(s)
+                size += len(s) + 1
+
+    for event, el in etree.iterwalk(doc, events=("start", "end", "comment", "pi")):
+        if size >= limit:
+            if not have_time:
+                time_el = next(doc.iterfind(".//time[@datetime]"), None)
+                if time_el is not None:
+                    page.time_datetime = time_el.get("datetime")
+            break
+        if event == "end":
+            if el.tag == "template":
+                in_template -= 1
+            add(el.tail)
+            continue
+        if event != "start":
+            # Comments/PIs contribute no text of their own, only their tail
+            add(el.tail)
+            continue
+
+        tag = el.tag
+        if tag == "template":
+            in_template += 1
+        elif tag not in _NON_TEXT_TAGS:
+            add(el.text)
+
+        if tag == "meta":
+            content = el.get("content") or ""
+            name = el.get("name")
+            if name is not None:
+                page.by_name.setdefault(name, content)
+            prop = el.get("property")
+            if prop is not None:
+                page.by_property.setdefault(prop, content)
+        elif tag == "a":
+            href = el.get("href")
+            if href is not None:
+                page.hrefs.append(href)
+        elif tag == "img":
+            page.image_count += 1
+        elif tag in ("video", "iframe"):
+            page.video_count += 1
+        elif tag == "title" and not have_title:
+            have_title = True
+            page.title = (el.text or "").strip()
+        elif tag == "link" and not have_canonical:
+            if "canonical" in (el.get("rel") or "").split():
+                have_canonical = True
+                page.canonical_url = el.get("href", "")
+        elif tag == "time" and not have_time:
+            datetime_attr = el.get("datetime")
+            if datetime_attr is not None:
+                have_time = True
+                page.time_datetime = datetime_attr
+
+    page.text = " ".join(strings)
+    return page
+
+
+def _page_date(page: _PageScan, metas: dict[str, str]) -> str | None:
+    """Publication date from a _scan_page result: meta, <time>, then text."""
+    return (
+        _date_from_meta(metas)
+        or _parse_date_string(page.time_datetime)
+        or _find_date_in_text(page.text[:1000])
+    )
+
+
+def _date_from_meta(metas: dict[str, str]) -> str | None:
+    """First parseable date among the _DATE_META_NAMES meta values."""
+    for name in _DATE_META_NAMES:
+        content = metas.get(name)
+        if content:
+            parsed = _parse_date_string(content)
+            if parsed:
+                return parsed
     return None
 
 
-def _get_title(soup: BeautifulSoup) -> str:
-    """Get page title."""
-    title_tag = soup.find("title")
-    return title_tag.get_text(strip=True) if title_tag else ""
+def _link_netloc(href: str) -> str:
+    """urlparse(href).netloc, skipping urlparse for the common href shapes."""
+    match = _HTTP_NETLOC_RE.match(href)
+    if match:
+        return match.group(1)
+    # Root-relative path: no netloc, unless urlparse's tab/newline removal
+    # could turn the start into "//"
+    if href[:1] == "/" and href[1:2] not in ("", "/", "\t", "\r", "\n"):
+        return ""
+    return urlparse(href).netloc
+
+
+def _merge_meta(by_name: dict[str, str], by_property: dict[str, str]) -> dict[str, str]:
+    """Merge first-seen meta name= and property= contents into one map.
+
+    Keeps the lookup rule of _get_meta: the first name= tag wins if it has
+    content, else the first property= tag; empty content counts as missing.
+    """
+    metas = {key: content for key, content in by_property.items() if content}
+    metas.update((key, content) for key, content in by_name.items() if content)
+    return metas
+
+
+def _get_meta(metas: dict[str, str], name: str) -> str | None:
+    """Get content from a meta tag by name or property."""
+    return metas.get(name)
 
 
 def _parse_date_string(date_str: str) -> str | None:
@@ -178,7 +398,7 @@ def _parse_date_string(date_str: str) -> str | None:
             dt = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
             return dt.strftime("%Y-%m-%d")
         # Try YYYY-MM-DD directly
-        if re.match(r"^\d{4}-\d{2}-\d{2}", date_str):
+        if _DATE_ISO_RE.match(date_str):
             return date_str[:10]
     except (ValueError, TypeError):
         pass
@@ -186,40 +406,44 @@ def _parse_date_string(date_str: str) -> str | None:
 
 
 def _find_date_in_text(text: str) -> str | None:
-    """Find a date pattern in text content."""
-    patterns = [
-        (r"(\d{4}-\d{2}-\d{2})", "%Y-%m-%d"),
-        (
-            r"((?:January|February|March|April|May|June|July|August|September|"
-            r"October|November|December|Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|"
-            r"Oct|Nov|Dec)[a-z]*\.?\s+\d{1,2},?\s+\d{4})",
-            None,
-        ),
-        (
-            r"(\d{1,2}\s+(?:January|February|March|April|May|June|July|August|"
-            r"September|October|November|December)\s+\d{4})",
-            None,
-        ),
-    ]
+    """Find a date pattern in text content.
 
-    for pattern, fmt in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            date_str = match.group(1)
-            if fmt:
-                try:
-                    dt = datetime.strptime(date_str, fmt)
-                    return dt.strftime("%Y-%m-%d")
-                except ValueError:
-                    pass
-            else:
-                # Try multiple date formats
-                cleaned = date_str.replace(",", "").replace(".", "")
-                for date_fmt in ("%B %d %Y", "%b %d %Y", "%d %B %Y"):
-                    try:
-                        dt = datetime.strptime(cleaned, date_fmt)
-                        return dt.strftime("%Y-%m-%d")
-                    except ValueError:
-                        continue
+    Like searching for each shape in turn, only the first occurrence of a
+    shape is tried before falling back to the next one.
+    """
+    iso_seen = False
+    mdy = dmy = None
+    for match in _DATE_RE.finditer(text):
+        if match["iso"]:
+            if not iso_seen:
+                iso_seen = True
+                parsed = _try_strptime(match["iso"], "%Y-%m-%d")
+                if parsed:
+                    return parsed
+        elif match["mdy_month"]:
+            mdy = mdy or match
+        else:
+            dmy = dmy or match
 
+    if mdy:
+        date_str = f"{mdy['mdy_month']} {mdy['mdy_day']} {mdy['mdy_year']}"
+        parsed = _try_strptime(date_str, "%B %d %Y") or _try_strptime(date_str, "%b %d %Y")
+        if parsed:
+            return parsed
+    if dmy:
+        date_str = f"{dmy['dmy_day']} {dmy['dmy_month']} {dmy['dmy_year']}"
+        return _try_strptime(date_str, "%d %B %Y")
     return None
+
+
+@lru_cache(maxsize=1024)
+def _try_strptime(date_str: str, fmt: str) -> str | None:
+    """Parse *date_str* with *fmt* into YYYY-MM-DD, or None.
+
+    Cached: pages from one site repeat the same date strings, and strptime
+    is slow (it goes through the locale-aware _strptime regex machinery).
+    """
+    try:
+        return datetime.strptime(date_str, fmt).strftime("%Y-%m-%d")
+    except ValueError:
+        return None
@@ -9,6 +9,20 @@ import httpx
 MAX_RESPONSE_BYTES = 50 * 1024 * 1024  # 50MB for HTML pages
 MAX_REDIRECTS = 5
 
+# Connection pool for static_client(); keep-alive matters once a client
+# is shared across many fetches
+STATIC_CLIENT_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+
+_DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/131.0.0.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
 
 @dataclass
 class FetchResult:
@@ -127,50 +141,68 @@ class BrowserSession:
             await page.close()
 
 
-async def fetch_static(
-    url: str,
+def static_client(
     timeout: int = 30,
     follow_redirects: bool = True,
     headers: dict[str, str] | None = None,
     verify_ssl: bool = True,
-) -> FetchResult:
-    """Fast fetch with httpx (no JS rendering)."""
-    default_headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/131.0.0.0 Safari/537.36"
-        ),
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-        "Accept-Language": "en-US,en;q=0.9",
-    }
-    if headers:
-        default_headers.update(headers)
-
-    async with httpx.AsyncClient(
+) -> httpx.AsyncClient:
+    """Build the httpx client fetch_static uses.
+
+    Callers fetching many URLs should create one, pass it to each
+    fetch_static(client=...) call, and close it when done (``async with``),
+    so connections and TLS sessions are reused instead of re-established.
+    Library API: the CLI fetches a single URL statically and does not use it.
+    """
+    return httpx.AsyncClient(
         timeout=timeout,
         follow_redirects=follow_redirects,
         max_redirects=MAX_REDIRECTS,
-        headers=default_headers,
+        headers={**_DEFAULT_HEADERS, **(headers or {})},
         verify=verify_ssl,
-    ) as client:
-        async with client.stream("GET", url) as response:
-            chunks = []
-            size = 0
-            async for chunk in response.aiter_bytes(chunk_size=8192):
-                size += len(chunk)
-                if size > MAX_RESPONSE_BYTES:
-                    raise ValueError(
-                        f"Response exceeds {MAX_RESPONSE_BYTES // (1024 * 1024)}MB size limit"
-                    )
-                chunks.append(chunk)
-
-            content = b"".join(chunks)
-            text = content.decode(response.charset_encoding or "utf-8", errors="replace")
+        limits=STATIC_CLIENT_LIMITS,
+    )
 
-            return FetchResult(
-                html=text,
-                url=str(response.url),
-                status=response.status_code,
-                headers=dict(response.headers),
-            )
+
+async def fetch_static(
+    url: str,
+    timeout: int = 30,
+    follow_redirects: bool = True,
+    headers: dict[str, str] | None = None,
+    verify_ssl: bool = True,
+    client: httpx.AsyncClient | None = None,
+) -> FetchResult:
+    """Fast fetch with httpx (no JS rendering).
+
+    Pass a *client* from static_client() to reuse its connections; the other
+    options are then taken from that client. Without one, a client is
+    opened and closed for this fetch alone.
+    """
+    if client is None:
+        async with static_client(timeout, follow_redirects, headers, verify_ssl) as client:
+            return await _fetch_with_client(client, url)
+    return await _fetch_with_client(client, url)
+
+
+async def _fetch_with_client(client: httpx.AsyncClient, url: str) -> FetchResult:
+    """Stream *url* through *client*, enforcing MAX_RESPONSE_BYTES."""
+    async with client.stream("GET", url) as response:
+        chunks = []
+        size = 0
+        async for chunk in response.aiter_bytes(chunk_size=8192):
+            size += len(chunk)
+            if size > MAX_RESPONSE_BYTES:
+                raise ValueError(
+                    f"Response exceeds {MAX_RESPONSE_BYTES // (1024 * 1024)}MB size limit"
+                )
+            chunks.append(chunk)
+
+        content = b"".join(chunks)
+        text = content.decode(response.charset_encoding or "utf-8", errors="replace")
+
+        return FetchResult(
+            html=text,
+            url=str(response.url),
+            status=response.status_code,
+            headers=dict(response.headers),
+        )
@@ -2,16 +2,19 @@
 
 from __future__ import annotations
 
+import asyncio
 from io import BytesIO
 from pathlib import Path
 
 from PIL import Image
 
+from c2md.utils import run_sync
+
 
 def save_markdown(content: str, output_path: Path) -> None:
-    """Save markdown content to file."""
+    """Save markdown content to file (UTF-8, no newline translation)."""
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(content, encoding="utf-8")
+    output_path.write_bytes(content.encode("utf-8"))
 
 
 def save_screenshot(
@@ -59,36 +62,60 @@ def save_archive(
     screenshot_quality: int = 85,
 ) -> list[Path]:
     """Save all formats into a directory. Returns list of saved paths."""
+    return run_sync(save_archive_async(
+        markdown, output_dir,
+        screenshot_bytes=screenshot_bytes,
+        pdf_bytes=pdf_bytes,
+        metadata_bytes=metadata_bytes,
+        references=references,
+        screenshot_quality=screenshot_quality,
+    ))
+
+
+async def save_archive_async(
+    markdown: str,
+    output_dir: Path,
+    screenshot_bytes: bytes | None = None,
+    pdf_bytes: bytes | None = None,
+    metadata_bytes: bytes | None = None,
+    references: str | None = None,
+    screenshot_quality: int = 85,
+) -> list[Path]:
+    """Async save_archive(): the files are written concurrently in threads."""
     output_dir.mkdir(parents=True, exist_ok=True)
     saved: list[Path] = []
+    writes = []
 
     # Markdown
     md_path = output_dir / "article.md"
-    md_path.write_text(markdown, encoding="utf-8")
+    writes.append(asyncio.to_thread(md_path.write_bytes, markdown.encode("utf-8")))
     saved.append(md_path)
 
     # References
     if references:
         refs_path = output_dir / "references.md"
-        refs_path.write_text(references, encoding="utf-8")
+        writes.append(asyncio.to_thread(refs_path.write_bytes, references.encode("utf-8")))
         saved.append(refs_path)
 
     # Screenshot
     if screenshot_bytes:
         screenshot_path = output_dir / "screenshot.png"
-        save_screenshot(screenshot_bytes, screenshot_path, quality=screenshot_quality)
+        writes.append(asyncio.to_thread(
+            save_screenshot, screenshot_bytes, screenshot_path, quality=screenshot_quality,
+        ))
         saved.append(screenshot_path)
 
     # PDF
     if pdf_bytes:
         pdf_path = output_dir / "article.pdf"
-        pdf_path.write_bytes(pdf_bytes)
+        writes.append(asyncio.to_thread(pdf_path.write_bytes, pdf_bytes))
         saved.append(pdf_path)
 
     # Metadata
     if metadata_bytes:
         meta_path = output_dir / "metadata.json"
-        meta_path.write_bytes(metadata_bytes)
+        writes.append(asyncio.to_thread(meta_path.write_bytes, metadata_bytes))
         saved.append(meta_path)
 
+    await asyncio.gather(*writes)
     return saved
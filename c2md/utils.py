@@ -1,13 +1,95 @@
 """Utility functions for c2md."""
 
+import asyncio
 import re
+from collections.abc import Coroutine
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
 from urllib.parse import urlparse
 
+import xxhash
+from lxml import html as lxml_html
+from lxml.etree import ParserError
+
+_NON_ALNUM_RE = re.compile(r"[^a-zA-Z0-9]+")
+_UNDERSCORES_RE = re.compile(r"_+")
+_WORD_RE = re.compile(r"\w+")
+
+# simhash() keeps 64 per-bit vote counters packed into one int, _FIELD_BITS
+# apart; _SPREAD[b] places the 8 bits of byte b into 8 consecutive fields.
+_FIELD_BITS = 32
+_FIELD_MASK = (1 << _FIELD_BITS) - 1
+_SPREAD = [
+    sum(1 << (i * _FIELD_BITS) for i in range(8) if b >> i & 1) for b in range(256)
+]
+
+# Fed UTF-8 bytes so documents carrying an XML encoding declaration still parse
+_HTML_PARSER = lxml_html.HTMLParser(encoding="utf-8")
+
+# Fingerprints within this many differing bits count as near-duplicates
+SIMHASH_MAX_DISTANCE = 3
+
+T = TypeVar("T")
+
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """Run *coro* to completion from synchronous code and return its result.
+
+    asyncio.run() raises inside a running event loop (async callers,
+    Jupyter), so there the coroutine runs on its own loop in a worker
+    thread instead. Either way the caller blocks until it finishes.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
+
+
+def parse_html(html: str) -> lxml_html.HtmlElement | None:
+    """Parse an HTML document with lxml; None if there is nothing to parse."""
+    try:
+        return lxml_html.document_fromstring(html.encode("utf-8"), parser=_HTML_PARSER)
+    except ParserError:
+        return None
+
 
 def url_to_slug(url: str) -> str:
     """Generate a filesystem-safe filename from a URL."""
     parsed = urlparse(url)
     slug = parsed.netloc + parsed.path
-    slug = re.sub(r"[^a-zA-Z0-9]+", "_", slug)
-    slug = re.sub(r"_+", "_", slug).strip("_")
+    slug = _NON_ALNUM_RE.sub("_", slug)
+    slug = _UNDERSCORES_RE.sub("_", slug).strip("_")
     return slug[:100] if slug else "page"
+
+
+def simhash(text: str) -> int:
+    """64-bit SimHash of *text* over 3-word shingles.
+
+    Texts that differ by a few words (a date, a view count) land within a few
+    bits of each other; compare with is_near_duplicate(). Text with no words
+    hashes to 0.
+    """
+    words = _WORD_RE.findall(text.lower())
+    if not words:
+        return 0
+    shingles = [" ".join(words[i:i + 3]) for i in range(max(1, len(words) - 2))]
+
+    counts = 0
+    for shingle in shingles:
+        h = xxhash.xxh64_intdigest(shingle.encode())
+        for k in range(8):
+            counts += _SPREAD[(h >> (8 * k)) & 0xFF] << (8 * k * _FIELD_BITS)
+
+    half = len(shingles) / 2
+    fingerprint = 0
+    for i in range(64):
+        if (counts >> (i * _FIELD_BITS)) & _FIELD_MASK > half:
+            fingerprint |= 1 << i
+    return fingerprint
+
+
+def is_near_duplicate(fingerprint: int, seen: list[int]) -> bool:
+    """True if *fingerprint* is within SIMHASH_MAX_DISTANCE bits of any in *seen*."""
+    return any((fingerprint ^ other).bit_count() <= SIMHASH_MAX_DISTANCE for other in seen)
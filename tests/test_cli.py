@@ -0,0 +1,131 @@
+"""Tests for c2md.cli deep-crawl orchestration."""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+
+import click
+import orjson
+import pytest
+from click.testing import CliRunner
+
+from c2md.cli import PARALLEL_CONVERT_MIN, _run_deep_crawl, main
+from c2md.convert import html_to_markdown
+from c2md.fetch import FetchResult
+
+
+def _page(url: str, body: str) -> FetchResult:
+    return FetchResult(html=f"<html><body><p>{body}</p></body></html>", url=url, status=200)
+
+
+def _run(
+    results: list[FetchResult], output_path: Path, trailing_slash: bool = True,
+    **overrides,
+) -> None:
+    """Run _run_deep_crawl on canned results (no browser), markdown mode."""
+    opts = dict(
+        mode="markdown", dedupe=True, sort_by_date=False, limit=None,
+        refs=False, no_images=False, embed_images=False,
+    )
+    opts.update(overrides)
+
+    def fake_run(coro):
+        coro.close()
+        return results
+
+    with patch("c2md.cli.asyncio.run", side_effect=fake_run):
+        _run_deep_crawl(
+            "https://example.com", True, False, 30, opts["mode"], "example_com",
+            10, 1, None, True, None, False, 85, None, opts["dedupe"],
+            opts["sort_by_date"], opts["limit"], opts["refs"], opts["no_images"],
+            opts["embed_images"], False, 800,
+            str(output_path) + ("/" if trailing_slash else ""),
+        )
+
+
+class TestDeepCrawlDedupe:
+    def test_drops_duplicate_pages(self, tmp_path: Path):
+        results = [
+            _page("https://example.com/a", "Same body"),
+            _page("https://example.com/b", "Same body"),
+            _page("https://example.com/c", "Different body"),
+        ]
+        _run(results, tmp_path)
+        saved = sorted(p.name for p in tmp_path.glob("*.md"))
+        assert saved == ["example_com_a.md", "example_com_c.md"]
+
+    def test_converts_each_page_once(self, tmp_path: Path):
+        results = [
+            _page("https://example.com/a", "First"),
+            _page("https://example.com/b", "Second"),
+        ]
+        with patch("c2md.cli.html_to_markdown", wraps=html_to_markdown) as spy:
+            _run(results, tmp_path)
+        assert spy.call_count == 2
+
+
+class TestDeepCrawlConversion:
+    def test_large_crawl_converts_in_process_pool(self, tmp_path: Path):
+        n = PARALLEL_CONVERT_MIN
+        results = [_page(f"https://example.com/p{i}", f"Body {i}") for i in range(n)]
+        with patch("c2md.cli.ProcessPoolExecutor", wraps=ProcessPoolExecutor) as pool:
+            _run(results, tmp_path, dedupe=False)
+        pool.assert_called_once()
+        saved = sorted(p.name for p in tmp_path.glob("*.md"))
+        assert len(saved) == n
+        assert "Body 3" in (tmp_path / "example_com_p3.md").read_text()
+
+    def test_small_crawl_converts_serially(self, tmp_path: Path):
+        n = PARALLEL_CONVERT_MIN - 1
+        results = [_page(f"https://example.com/p{i}", f"Body {i}") for i in range(n)]
+        with patch("c2md.cli.ProcessPoolExecutor") as pool:
+            _run(results, tmp_path, dedupe=False)
+        pool.assert_not_called()
+        assert len(list(tmp_path.glob("*.md"))) == n
+
+    def test_output_dir_created_without_trailing_slash(self, tmp_path: Path):
+        out_dir = tmp_path / "crawl"
+        results = [
+            _page("https://example.com/a", "First"),
+            _page("https://example.com/b", "Second"),
+        ]
+        _run(results, out_dir, trailing_slash=False, dedupe=False)
+        assert sorted(p.name for p in out_dir.glob("*.md")) == [
+            "example_com_a.md", "example_com_b.md",
+        ]
+
+    def test_output_path_naming_a_file_is_rejected(self, tmp_path: Path):
+        existing = tmp_path / "existing.md"
+        existing.write_text("keep")
+        for target in (existing, tmp_path / "new.md"):
+            with pytest.raises(click.ClickException, match="one file per page"):
+                _run([_page("https://example.com/a", "First")], target,
+                     trailing_slash=False)
+        assert existing.read_text() == "keep"
+        assert not (tmp_path / "new.md").exists()
+
+    def test_dotted_dir_name_with_trailing_slash(self, tmp_path: Path):
+        out_dir = tmp_path / "crawl.v2"
+        _run([_page("https://example.com/a", "First")], out_dir)
+        assert (out_dir / "example_com_a.md").exists()
+
+
+class TestMetadataMode:
+    def test_metadata_json_to_stdout(self):
+        page = FetchResult(
+            html="<html><head><title>Tést</title></head><body>Hi</body></html>",
+            url="https://example.com", status=200,
+        )
+
+        def fake_run(coro):
+            coro.close()
+            return page
+
+        with patch("c2md.cli.asyncio.run", side_effect=fake_run):
+            result = CliRunner().invoke(main, ["https://example.com", "-m", "metadata"])
+
+        assert result.exit_code == 0
+        assert result.stdout_bytes.endswith(b"}\n")
+        assert orjson.loads(result.stdout_bytes)["title"] == "Tést"
@@ -44,6 +44,29 @@ class TestHtmlToMarkdown:
         result = html_to_markdown(html, selector="article.post", strip_boilerplate=False)
         assert "Important content" in result
 
+    def test_css_selector_strips_unwanted_tags(self):
+        html = """
+        <html><body>
+            <article class="post">
+                <p>Kept paragraph</p>
+                <aside>Related posts</aside>
+                <script>var x = 1;</script>
+            </article>
+        </body></html>
+        """
+        result = html_to_markdown(html, selector="article.post", strip_boilerplate=False)
+        assert "Kept paragraph" in result
+        assert "Related posts" not in result
+        assert "var x" not in result
+
+    def test_css_selector_keeps_node_nested_in_stripped_tag(self):
+        html = (
+            "<article><header><h1>Post Title</h1></header>"
+            "<p>Body text.</p></article>"
+        )
+        result = html_to_markdown(html, selector="h1, article", strip_boilerplate=False)
+        assert result == "Body text.\n\n# Post Title"
+
     def test_links_preserved(self):
         html = '<p>Visit <a href="https://example.com">Example</a></p>'
         result = html_to_markdown(html, strip_boilerplate=False)
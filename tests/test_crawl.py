@@ -1,6 +1,38 @@
 """Tests for c2md.crawl module."""
 
-from c2md.crawl import _extract_links, _normalize_url
+import asyncio
+
+import pytest
+
+from c2md.crawl import _extract_links, _normalize_url, deep_crawl
+from c2md.fetch import FetchResult
+
+
+class _FakeSession:
+    """BrowserSession stand-in serving canned pages and tracking concurrency."""
+
+    def __init__(self, pages: dict[str, str], failing: set[str] = frozenset()):
+        self.pages = pages
+        self.failing = failing
+        self.fetched: list[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def fetch(self, url, screenshot=False, pdf=False):
+        self.fetched.append(url)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0)
+            if url in self.failing:
+                raise RuntimeError("navigation failed")
+            return FetchResult(html=self.pages.get(url, ""), url=url, status=200)
+        finally:
+            self.in_flight -= 1
+
+
+def _links_page(*paths: str) -> str:
+    return "".join(f'<a href="{p}">{p}</a>' for p in paths)
 
 
 class TestNormalizeUrl:
@@ -16,6 +48,15 @@ class TestNormalizeUrl:
     def test_preserves_path(self):
         assert _normalize_url("https://example.com/a/b/c") == "https://example.com/a/b/c"
 
+    def test_strips_query(self):
+        assert _normalize_url("https://example.com/page/?a=1") == "https://example.com/page"
+
+    def test_lowercases_scheme(self):
+        assert _normalize_url("HTTPS://example.com/page") == "https://example.com/page"
+
+    def test_path_params_match_urlparse(self):
+        assert _normalize_url("https://example.com/a;v=1") == "https://example.com/a"
+
 
 class TestExtractLinks:
     def test_same_domain_links(self):
@@ -58,6 +99,15 @@ class TestExtractLinks:
         assert not any(".pdf" in l for l in links)
         assert not any(".jpg" in l for l in links)
 
+    def test_skips_video_and_webp_but_not_query_lookalikes(self):
+        html = """
+        <a href="/clip.MP4">Video</a>
+        <a href="/pic.webp#top">Image</a>
+        <a href="/view?file=report.pdf">Viewer page</a>
+        """
+        links = _extract_links(html, "https://example.com", "example.com")
+        assert links == ["https://example.com/view?file=report.pdf"]
+
     def test_deduplicates(self):
         html = """
         <a href="/page">First</a>
@@ -67,3 +117,46 @@ class TestExtractLinks:
         links = _extract_links(html, "https://example.com", "example.com")
         # /page and /page/ normalize to the same thing
         assert len(links) <= 2  # at most /page and /page/ before normalization
+
+    def test_empty_html(self):
+        assert _extract_links("", "https://example.com", "example.com") == []
+        assert _extract_links("   ", "https://example.com", "example.com") == []
+
+    def test_xml_declaration(self):
+        html = (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<html><body><a href="/caf\u00e9">x</a></body></html>'
+        )
+        links = _extract_links(html, "https://example.com", "example.com")
+        assert links == ["https://example.com/caf\u00e9"]
+
+
+class TestDeepCrawl:
+    @pytest.mark.asyncio
+    async def test_fetches_concurrently_within_limit(self):
+        paths = [f"/p{i}" for i in range(8)]
+        session = _FakeSession({"https://example.com": _links_page(*paths)})
+        results = await deep_crawl(
+            "https://example.com", session, max_pages=20, concurrency=3,
+        )
+        assert len(results) == 9
+        assert 1 < session.max_in_flight <= 3
+
+    @pytest.mark.asyncio
+    async def test_respects_max_pages_and_order(self):
+        session = _FakeSession({"https://example.com": _links_page("/a", "/b", "/c", "/d")})
+        results = await deep_crawl("https://example.com", session, max_pages=3)
+        assert [r.url for r in results] == [
+            "https://example.com", "https://example.com/a", "https://example.com/b",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_failed_fetches_do_not_use_budget(self):
+        session = _FakeSession(
+            {"https://example.com": _links_page("/a", "/b", "/c")},
+            failing={"https://example.com/a"},
+        )
+        results = await deep_crawl("https://example.com", session, max_pages=3)
+        assert [r.url for r in results] == [
+            "https://example.com", "https://example.com/b", "https://example.com/c",
+        ]
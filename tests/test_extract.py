@@ -0,0 +1,195 @@
+"""Tests for c2md.extract module."""
+
+from unittest.mock import patch
+
+from bs4 import BeautifulSoup
+
+from c2md.utils import parse_html
+
+from c2md.extract import (
+    _find_date_in_text,
+    _scan_page,
+    extract_date_from_html,
+    extract_date_from_html_text,
+    extract_metadata,
+    sort_results_by_date,
+)
+
+
+class TestExtractDateFromHtml:
+    def test_meta_published_time(self):
+        html = '<meta property="article:published_time" content="2025-03-04T10:00:00Z">'
+        assert extract_date_from_html(BeautifulSoup(html, "lxml")) == "2025-03-04"
+
+    def test_time_element(self):
+        html = '<body><time datetime="2024-12-01">Dec 1</time></body>'
+        assert extract_date_from_html(BeautifulSoup(html, "lxml")) == "2024-12-01"
+
+    def test_date_in_text(self):
+        html = "<body><p>Posted on January 5, 2023 by staff.</p></body>"
+        assert extract_date_from_html(BeautifulSoup(html, "lxml")) == "2023-01-05"
+
+    def test_no_date(self):
+        html = "<body><p>Nothing to see.</p></body>"
+        assert extract_date_from_html(BeautifulSoup(html, "lxml")) is None
+
+    def test_text_date_skips_script(self):
+        html = "<body><script>var d = '2001-01-01';</script><p>Posted 2 March 2021</p></body>"
+        assert extract_date_from_html(BeautifulSoup(html, "lxml")) == "2021-03-02"
+
+
+    def test_walks_given_soup_without_reparsing(self):
+        soup = BeautifulSoup("<body><p>Posted 2 March 2021</p></body>", "lxml")
+        with patch("c2md.extract.parse_html") as mock_parse:
+            assert extract_date_from_html(soup) == "2021-03-02"
+        mock_parse.assert_not_called()
+
+
+class TestExtractDateFromHtmlText:
+    def test_meta_without_parsing(self):
+        html = (
+            "<html><head>"
+            "<meta content='2025-03-04T10:00:00Z' property='article:published_time'>"
+            "</head><body>Published 1 January 2020</body></html>"
+        )
+        with patch("c2md.extract.parse_html", wraps=parse_html) as mock_parse:
+            assert extract_date_from_html_text(html) == "2025-03-04"
+        mock_parse.assert_not_called()
+
+    def test_meta_priority_matches_soup_path(self):
+        html = (
+            '<meta property="article:published_time" content="2025-03-04">'
+            '<meta name="date" content="2024-01-02">'
+        )
+        assert extract_date_from_html_text(html) == "2024-01-02"
+        assert extract_date_from_html(BeautifulSoup(html, "lxml")) == "2024-01-02"
+
+    def test_ignores_meta_in_comments_and_scripts(self):
+        html = (
+            '<!-- <meta name="date" content="2001-01-01"> -->'
+            "<script>var s = '<meta name=\"date\" content=\"2002-02-02\">';</script>"
+            '<meta name="date" content="2024-05-05">'
+        )
+        assert extract_date_from_html_text(html) == "2024-05-05"
+        assert extract_date_from_html(BeautifulSoup(html, "lxml")) == "2024-05-05"
+
+    def test_falls_back_to_text(self):
+        html = "<body><p>Posted on 5 January 2023.</p></body>"
+        with (
+            patch("c2md.extract.parse_html", wraps=parse_html) as mock_parse,
+            patch("c2md.extract._scan_page", wraps=_scan_page) as mock_scan,
+        ):
+            assert extract_date_from_html_text(html) == "2023-01-05"
+        assert mock_parse.call_count == 1
+        assert mock_scan.call_count == 1
+
+
+class TestExtractMetadata:
+    def test_basic_fields(self):
+        html = """
+        <html><head>
+            <title>Page Title</title>
+            <meta name="description" content="A description">
+            <meta name="author" content="Jane">
+            <link rel="canonical" href="https://example.com/post">
+        </head><body>
+            <p>One two three four.</p>
+            <a href="/internal">in</a>
+            <a href="https://other.com/x">out</a>
+            <a href="https://other.com/y">out</a>
+            <a href="mailto:a@b.c">mail</a>
+            <img src="a.png"><iframe src="v"></iframe>
+        </body></html>
+        """
+        meta = extract_metadata(html, "https://example.com/post")
+        assert meta["title"] == "Page Title"
+        assert meta["description"] == "A description"
+        assert meta["author"] == "Jane"
+        assert meta["canonical_url"] == "https://example.com/post"
+        assert meta["internal_link_count"] == 1
+        assert meta["external_link_count"] == 2
+        assert meta["top_external_domains"] == ["other.com"]
+        assert meta["image_count"] == 1
+        assert meta["video_count"] == 1
+
+    def test_link_classification_by_netloc(self):
+        html = (
+            '<a href="https://example.com/a">same</a>'
+            '<a href="HTTPS://example.com/b">same, upper-case scheme</a>'
+            '<a href="/c">root-relative</a>'
+            '<a href="d.html">relative</a>'
+            '<a href="//cdn.example.net/e">protocol-relative</a>'
+            '<a href="https://example.com.evil.test/f">lookalike</a>'
+        )
+        meta = extract_metadata(html, "https://example.com/")
+        assert meta["internal_link_count"] == 4
+        assert meta["external_link_count"] == 2
+        assert set(meta["top_external_domains"]) == {"cdn.example.net", "example.com.evil.test"}
+
+    def test_og_title_preferred(self):
+        html = '<title>Plain</title><meta property="og:title" content="OG Title">'
+        assert extract_metadata(html, "https://example.com")["title"] == "OG Title"
+
+    def test_single_parse_and_walk(self):
+        html = (
+            "<html><head><meta name='date' content='2024-05-06'></head><body>"
+            "<p>Visible words here</p><script>var hidden = 1;</script>"
+            "<template><p>not shown</p></template><!-- note -->tail"
+            "</body></html>"
+        )
+        with (
+            patch("c2md.extract.parse_html", wraps=parse_html) as mock_parse,
+            patch("c2md.extract._scan_page", wraps=_scan_page) as mock_scan,
+        ):
+            meta = extract_metadata(html, "https://example.com")
+        assert mock_parse.call_count == 1
+        assert mock_scan.call_count == 1
+        assert meta["published_date"] == "2024-05-06"
+        assert meta["word_count"] == 4
+
+    def test_empty_html(self):
+        meta = extract_metadata("", "https://example.com")
+        assert meta["title"] == ""
+        assert meta["word_count"] == 0
+
+
+class TestFindDateInText:
+    def test_iso_outranks_earlier_month_name(self):
+        assert _find_date_in_text("Jan 5, 2023 (updated 2024-02-03)") == "2024-02-03"
+
+    def test_abbreviated_month_with_period(self):
+        assert _find_date_in_text("Posted Sep. 9, 2021") == "2021-09-09"
+
+    def test_invalid_iso_falls_back(self):
+        assert _find_date_in_text("2023-13-45 or 7 July 2022") == "2022-07-07"
+
+
+class TestSortResultsByDate:
+    RESULTS = [
+        {"url": "https://a", "published_date": None},
+        {"url": "https://b", "published_date": "2024-01-01"},
+        {"url": "https://c", "published_date": "2025-06-01"},
+    ]
+
+    def test_descending_puts_undated_last(self):
+        urls = [r["url"] for r in sort_results_by_date(self.RESULTS)]
+        assert urls == ["https://c", "https://b", "https://a"]
+
+    def test_ascending_puts_undated_last(self):
+        urls = [r["url"] for r in sort_results_by_date(self.RESULTS, descending=False)]
+        assert urls == ["https://b", "https://c", "https://a"]
+
+
+class TestScanPage:
+    def test_text_limit_stops_walk_early(self):
+        html = (
+            "<body>" + "<p>word word word</p>" * 200
+            + "<a href='/late'>late</a><img src='x.png'>"
+            + "<time datetime='2022-08-09'>then</time></body>"
+        )
+        full = _scan_page(parse_html(html))
+        page = _scan_page(parse_html(html), text_limit=50)
+        assert page.text[:50] == full.text[:50]
+        assert len(page.text) < 100
+        assert page.hrefs == [] and page.image_count == 0
+        assert page.time_datetime == "2022-08-09"
@@ -187,3 +187,13 @@ class TestFetchStaticHardening:
             from c2md.fetch import fetch_static
             with pytest.raises(ValueError, match="size limit"):
                 await fetch_static("https://example.com")
+
+    @pytest.mark.asyncio
+    async def test_reuses_given_client(self):
+        client = _FakeClient(_FakeStream([b"<html>shared</html>"]))
+
+        with patch("c2md.fetch.httpx.AsyncClient", side_effect=AssertionError):
+            from c2md.fetch import fetch_static
+            result = await fetch_static("https://example.com", client=client)
+
+        assert result.html == "<html>shared</html>"
@@ -4,9 +4,10 @@ from __future__ import annotations
 
 from io import BytesIO
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
+import pytest
 from PIL import Image
 
 from c2md.fetch import MAX_REDIRECTS
@@ -14,24 +15,25 @@ from c2md.media import (
     MAX_IMAGE_BYTES,
     download_and_compress_images,
     download_images_as_base64,
+    embed_images_in_markdown,
     find_image_urls,
 )
 
 
-def _make_tiny_jpeg() -> bytes:
-    """Create a minimal valid JPEG image in memory."""
-    img = Image.new("RGB", (10, 10), color="red")
+def _make_tiny_jpeg(width: int = 10, fmt: str = "JPEG") -> bytes:
+    """Create a minimal valid image (JPEG by default) in memory."""
+    img = Image.new("RGB", (width, 10), color="red")
     buf = BytesIO()
-    img.save(buf, "JPEG")
+    img.save(buf, fmt)
     return buf.getvalue()
 
 
 def _mock_httpx_client(response: MagicMock) -> tuple[MagicMock, MagicMock]:
-    """Return (mock_cls, mock_client) for patching httpx.Client."""
+    """Return (mock_cls, mock_client) for patching httpx.AsyncClient."""
     mock_client = MagicMock()
-    mock_client.get.return_value = response
-    mock_client.__enter__ = MagicMock(return_value=mock_client)
-    mock_client.__exit__ = MagicMock(return_value=False)
+    mock_client.get = AsyncMock(return_value=response)
+    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
+    mock_client.__aexit__ = AsyncMock(return_value=False)
     mock_cls = MagicMock(return_value=mock_client)
     return mock_cls, mock_client
 
@@ -51,7 +53,7 @@ class TestDownloadAndCompressImages:
         resp = _make_response(b"x" * (MAX_IMAGE_BYTES + 1))
         mock_cls, _ = _mock_httpx_client(resp)
 
-        with patch("c2md.media.httpx.Client", mock_cls):
+        with patch("c2md.media.httpx.AsyncClient", mock_cls):
             result = download_and_compress_images(
                 ["https://example.com/big.jpg"], tmp_path
             )
@@ -61,7 +63,7 @@ class TestDownloadAndCompressImages:
         resp = _make_response(b"<html>not an image</html>", "text/html")
         mock_cls, _ = _mock_httpx_client(resp)
 
-        with patch("c2md.media.httpx.Client", mock_cls):
+        with patch("c2md.media.httpx.AsyncClient", mock_cls):
             result = download_and_compress_images(
                 ["https://example.com/fake.jpg"], tmp_path
             )
@@ -71,17 +73,59 @@ class TestDownloadAndCompressImages:
         resp = _make_response(_make_tiny_jpeg())
         mock_cls, _ = _mock_httpx_client(resp)
 
-        with patch("c2md.media.httpx.Client", mock_cls):
+        with patch("c2md.media.httpx.AsyncClient", mock_cls):
             result = download_and_compress_images(
                 ["https://example.com/real.jpg"], tmp_path
             )
         assert "https://example.com/real.jpg" in result
 
+    def test_small_jpeg_written_unchanged(self, tmp_path: Path):
+        original = _make_tiny_jpeg()
+        mock_cls, _ = _mock_httpx_client(_make_response(original))
+
+        with patch("c2md.media.httpx.AsyncClient", mock_cls):
+            result = download_and_compress_images(
+                ["https://example.com/real.jpg"], tmp_path
+            )
+        assert result["https://example.com/real.jpg"].read_bytes() == original
+
+    def test_wide_or_non_jpeg_is_reencoded(self, tmp_path: Path):
+        for src, content in [
+            ("https://example.com/wide.jpg", _make_tiny_jpeg(width=50)),
+            ("https://example.com/small.png", _make_tiny_jpeg(fmt="PNG")),
+        ]:
+            mock_cls, _ = _mock_httpx_client(_make_response(content, "image/png"))
+            with patch("c2md.media.httpx.AsyncClient", mock_cls):
+                result = download_and_compress_images([src], tmp_path, max_width=20)
+            with Image.open(result[src]) as img:
+                assert img.format == "JPEG"
+                assert img.width <= 20
+
+    def test_duplicate_urls_fetched_once(self, tmp_path: Path):
+        mock_cls, mock_client = _mock_httpx_client(_make_response(_make_tiny_jpeg()))
+        urls = ["https://example.com/a.jpg", "https://example.com/b.jpg"]
+
+        with patch("c2md.media.httpx.AsyncClient", mock_cls):
+            result = download_and_compress_images(urls + urls, tmp_path)
+        assert set(result) == set(urls)
+        assert mock_client.get.await_count == 2
+        assert mock_cls.call_count == 1
+
+    def test_batch_transcodes_every_image(self, tmp_path: Path):
+        mock_cls, _ = _mock_httpx_client(_make_response(_make_tiny_jpeg(width=50)))
+        urls = [f"https://example.com/{i}.jpg" for i in range(6)]
+
+        with patch("c2md.media.httpx.AsyncClient", mock_cls):
+            result = download_and_compress_images(urls, tmp_path, max_width=20)
+        assert set(result) == set(urls)
+        with Image.open(result[urls[0]]) as img:
+            assert img.width == 20
+
     def test_redirect_limit(self, tmp_path: Path):
         mock_cls, mock_client = _mock_httpx_client(MagicMock())
         mock_client.get.side_effect = httpx.ConnectError("skip")
 
-        with patch("c2md.media.httpx.Client", mock_cls):
+        with patch("c2md.media.httpx.AsyncClient", mock_cls):
             download_and_compress_images(
                 ["https://example.com/img.jpg"], tmp_path
             )
@@ -93,7 +137,7 @@ class TestDownloadImagesAsBase64:
         resp = _make_response(b"x" * (MAX_IMAGE_BYTES + 1))
         mock_cls, _ = _mock_httpx_client(resp)
 
-        with patch("c2md.media.httpx.Client", mock_cls):
+        with patch("c2md.media.httpx.AsyncClient", mock_cls):
             result = download_images_as_base64(["https://example.com/big.jpg"])
         assert "https://example.com/big.jpg" not in result
 
@@ -101,7 +145,7 @@ class TestDownloadImagesAsBase64:
         resp = _make_response(b"not an image", "text/html")
         mock_cls, _ = _mock_httpx_client(resp)
 
-        with patch("c2md.media.httpx.Client", mock_cls):
+        with patch("c2md.media.httpx.AsyncClient", mock_cls):
             result = download_images_as_base64(["https://example.com/fake.jpg"])
         assert "https://example.com/fake.jpg" not in result
 
@@ -109,11 +153,19 @@ class TestDownloadImagesAsBase64:
         resp = _make_response(_make_tiny_jpeg())
         mock_cls, _ = _mock_httpx_client(resp)
 
-        with patch("c2md.media.httpx.Client", mock_cls):
+        with patch("c2md.media.httpx.AsyncClient", mock_cls):
             result = download_images_as_base64(["https://example.com/real.jpg"])
         uri = result["https://example.com/real.jpg"]
         assert uri.startswith("data:image/jpeg;base64,")
 
+    @pytest.mark.asyncio
+    async def test_works_inside_running_event_loop(self):
+        mock_cls, _ = _mock_httpx_client(_make_response(_make_tiny_jpeg()))
+
+        with patch("c2md.media.httpx.AsyncClient", mock_cls):
+            result = download_images_as_base64(["https://example.com/real.jpg"])
+        assert result["https://example.com/real.jpg"].startswith("data:image/jpeg")
+
 
 class TestFindImageUrls:
     def test_extracts_http_urls(self):
@@ -127,3 +179,24 @@ class TestFindImageUrls:
 
     def test_ignores_data_uris(self):
         assert len(find_image_urls("![alt](data:image/png;base64,abc123)")) == 0
+
+
+class TestEmbedImagesInMarkdown:
+    def test_replaces_every_occurrence(self):
+        md = "![a](https://x.com/a.png)\n![b](https://x.com/b.png)\n[1] https://x.com/a.png"
+        out = embed_images_in_markdown(md, {
+            "https://x.com/a.png": "data:A",
+            "https://x.com/b.png": "data:B",
+        })
+        assert out == "![a](data:A)\n![b](data:B)\n[1] data:A"
+
+    def test_prefix_url_does_not_clip_longer_url(self):
+        md = "![](https://x.com/a.png) ![](https://x.com/a.png?v=2)"
+        out = embed_images_in_markdown(md, {
+            "https://x.com/a.png": "data:A",
+            "https://x.com/a.png?v=2": "data:A2",
+        })
+        assert out == "![](data:A) ![](data:A2)"
+
+    def test_empty_mapping(self):
+        assert embed_images_in_markdown("![](https://x.com/a.png)", {}) == "![](https://x.com/a.png)"
@@ -0,0 +1,43 @@
+"""Tests for c2md.output module."""
+
+from __future__ import annotations
+
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from c2md.output import save_archive
+
+
+def _make_png() -> bytes:
+    buf = BytesIO()
+    Image.new("RGB", (4, 4), color="blue").save(buf, "PNG")
+    return buf.getvalue()
+
+
+class TestSaveArchive:
+    def test_writes_all_parts(self, tmp_path: Path):
+        saved = save_archive(
+            "# Title", tmp_path / "arch",
+            screenshot_bytes=_make_png(),
+            pdf_bytes=b"%PDF-1.4",
+            metadata_bytes=b"{}",
+            references="[1] https://example.com",
+        )
+        assert [p.name for p in saved] == [
+            "article.md", "references.md", "screenshot.png", "article.pdf", "metadata.json",
+        ]
+        assert (tmp_path / "arch" / "article.md").read_text(encoding="utf-8") == "# Title"
+        assert (tmp_path / "arch" / "article.pdf").read_bytes() == b"%PDF-1.4"
+        assert (tmp_path / "arch" / "screenshot.png").stat().st_size > 0
+
+    def test_markdown_only(self, tmp_path: Path):
+        saved = save_archive("body", tmp_path)
+        assert saved == [tmp_path / "article.md"]
+
+    @pytest.mark.asyncio
+    async def test_sync_wrapper_inside_running_loop(self, tmp_path: Path):
+        saved = save_archive("body", tmp_path)
+        assert saved == [tmp_path / "article.md"]
@@ -3,6 +3,8 @@
 Ported from c4md tests/test_processors.py.
 """
 
+from unittest.mock import patch
+
 from c2md._postprocess import (
     clean_markdown,
     collapse_blank_lines,
@@ -69,6 +71,11 @@ class TestFixHeadingLinebreaks:
     def test_empty_string(self):
         assert fix_heading_linebreaks("") == ""
 
+    def test_consecutive_orphaned_headings(self):
+        md = "#\nOne\nTwo\n##\nThree\n\nText\n###\nFour"
+        result = fix_heading_linebreaks(md)
+        assert result == "# One Two\n## Three\n\nText\n### Four"
+
 
 class TestFixCitationDuplication:
     def test_basic_duplication(self):
@@ -109,6 +116,16 @@ class TestFixCitationDuplication:
         result = fix_citation_duplication(md)
         assert result == md
 
+    def test_matches_regex_sub(self):
+        from c2md._postprocess import _CITE_DUP_RE
+
+        md = (
+            "See [docs](u) Read more[4]Read more, a[1]a[2]a, x [7] y\n"
+            "Sign up  [10]  Sign up today [11]"
+        ) * 3
+        expected = _CITE_DUP_RE.sub(lambda m: f"{m.group(1)}[{m.group(2)}]", md)
+        assert fix_citation_duplication(md) == expected
+
 
 class TestStripEmptyImageLinks:
     def test_empty_image(self):
@@ -152,6 +169,10 @@ class TestStripEmptyImageLinks:
         result = strip_empty_image_links(md)
         assert result == md
 
+    def test_adjacent_empty_links_all_removed(self):
+        assert strip_empty_image_links("!![](x)[](y)") == "!"
+        assert clean_markdown("!![](x)[](y)") == "!"
+
 
 class TestCollapseBlankLines:
     def test_collapses_many_blank_lines(self):
@@ -193,3 +214,24 @@ class TestCleanMarkdown:
         md = "Content here.\n\n\n"
         result = clean_markdown(md)
         assert result == "Content here."
+
+    def test_single_pass_matches_individual_fixups(self):
+        md = "Foo[1]Foo\n\n\n\n\n![](a.png) text [](b) Bar [2] Bar"
+        expected = collapse_blank_lines(
+            strip_empty_image_links(fix_citation_duplication(md))
+        ).strip()
+        assert clean_markdown(md) == expected
+
+    def test_skips_passes_without_triggers(self):
+        md = "Plain prose.\n\nNo headings, brackets, or blank runs."
+        with (
+            patch("c2md._postprocess.fix_heading_linebreaks") as mock_heading,
+            patch("c2md._postprocess.fix_citation_duplication") as mock_cite,
+        ):
+            assert clean_markdown(md) == md
+        mock_heading.assert_not_called()
+        mock_cite.assert_not_called()
+
+    def test_empty_link_scan_edge_cases(self):
+        md = "a []() b ![](x)  [](y)\nc ![](z"
+        assert clean_markdown(md) == "a []() b c ![](z"
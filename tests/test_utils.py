@@ -0,0 +1,59 @@
+"""Tests for c2md.utils module."""
+
+import pytest
+
+from c2md.utils import is_near_duplicate, run_sync, simhash, url_to_slug
+
+ARTICLE = " ".join(
+    f"Sentence {i} talks about topic {i % 7} in some detail." for i in range(200)
+)
+
+
+class TestUrlToSlug:
+    def test_basic(self):
+        assert url_to_slug("https://example.com/a/b") == "example_com_a_b"
+
+    def test_empty_path(self):
+        assert url_to_slug("") == "page"
+
+
+class TestSimhash:
+    def test_identical_text_same_fingerprint(self):
+        assert simhash(ARTICLE) == simhash(ARTICLE)
+
+    def test_near_duplicate_detected(self):
+        edited = ARTICLE.replace("Sentence 50 ", "Sentence fifty ")
+        assert is_near_duplicate(simhash(edited), [simhash(ARTICLE)])
+
+    def test_different_text_not_duplicate(self):
+        other = " ".join(f"Unrelated line {i} about cooking {i * 3}." for i in range(200))
+        assert not is_near_duplicate(simhash(other), [simhash(ARTICLE)])
+
+    def test_empty_text(self):
+        assert simhash("") == 0
+        assert simhash(" \n\t ") == 0
+
+    def test_empty_and_short_text_not_duplicate_of_article(self):
+        seen = [simhash(ARTICLE)]
+        assert not is_near_duplicate(simhash(""), seen)
+        assert not is_near_duplicate(simhash("Hi"), seen)
+        assert not is_near_duplicate(simhash("Page not found"), seen)
+
+    def test_empty_pages_duplicate_each_other(self):
+        assert is_near_duplicate(simhash(""), [simhash("   ")])
+
+    def test_no_seen_fingerprints(self):
+        assert not is_near_duplicate(simhash(ARTICLE), [])
+
+
+async def _answer() -> int:
+    return 42
+
+
+class TestRunSync:
+    def test_without_running_loop(self):
+        assert run_sync(_answer()) == 42
+
+    @pytest.mark.asyncio
+    async def test_inside_running_loop(self):
+        assert run_sync(_answer()) == 42